@@ -1,36 +1,90 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import os
-import json
 import time
+import asyncio
 import logging
-from openai import OpenAI
+import functools
+import tiktoken
 from datetime import datetime
 
-def truncate_text(text, max_length=10000):
-    """テキストを指定された長さに切り詰める"""
-    if len(text) <= max_length:
+# 要約に使用するモデル
+MODEL = "gpt-4o-mini"
+
+# プロンプトテンプレート内で論文テキストを埋め込む位置
+PROMPT_PLACEHOLDER = "{論文テキスト}"
+
+@functools.lru_cache(maxsize=None)
+def compile_prompt_template(prompt_template):
+    """
+    プロンプトテンプレートを論文テキストの前後の部分に分割する
+    
+    論文ごとにテンプレートを解析し直さず、前後の文字列を連結するだけでプロンプトを作れるようにする。
+    
+    Args:
+        prompt_template (str): プロンプトテンプレート
+        
+    Returns:
+        tuple: (論文テキストの前の部分, 論文テキストの後の部分)
+    """
+    parts = prompt_template.split(PROMPT_PLACEHOLDER)
+    if len(parts) != 2:
+        raise ValueError(f"プロンプトテンプレートには {PROMPT_PLACEHOLDER} をちょうど1つ含めてください")
+    prefix, suffix = (part.replace("{{", "{").replace("}}", "}") for part in parts)
+    return prefix, suffix
+
+# 切り詰め前にトークン化する文字数の目安（1トークンあたりの文字数の上限として十分大きな値）
+TRUNCATE_CHARS_PER_TOKEN = 16
+
+@functools.lru_cache(maxsize=None)
+def _get_encoding(model=MODEL):
+    """モデルに対応するトークナイザーを取得する（初回のみ読み込み）"""
+    return tiktoken.encoding_for_model(model)
+
+def truncate_text(text, max_tokens=2500):
+    """
+    テキストを指定されたトークン数に切り詰める
+    
+    長い論文は全文をトークン化せず、先頭と末尾の十分な長さの文字列だけをトークン化する
+    （イベントループを長時間止めないため）。
+    """
+    encoding = _get_encoding()
+    half_tokens = max_tokens // 2
+    half_chars = half_tokens * TRUNCATE_CHARS_PER_TOKEN
+    if len(text) > 2 * half_chars:
+        head_tokens = encoding.encode(text[:half_chars], disallowed_special=())
+        tail_tokens = encoding.encode(text[-half_chars:], disallowed_special=())
+        if len(head_tokens) >= half_tokens and len(tail_tokens) >= half_tokens:
+            return (encoding.decode(head_tokens[:half_tokens]) + "\n...(中略)...\n" +
+                    encoding.decode(tail_tokens[-half_tokens:]))
+    
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
         return text
     
     # 最初の部分を保持
-    first_part = text[:max_length // 2]
+    first_part = encoding.decode(tokens[:max_tokens // 2])
     
     # 最後の部分を保持
-    last_part = text[-max_length // 2:]
+    last_part = encoding.decode(tokens[-(max_tokens // 2):])
     
     # 中間部分を省略したことを示す
     return first_part + "\n...(中略)...\n" + last_part
 
-def generate_summary(client, text, prompt_template, summary_dir, title, arxiv_id):
-    """論文の要約を生成する"""
+async def generate_summary(client, text, prompt_template, title, arxiv_id):
+    """
+    論文の要約を生成する
+    
+    同時呼び出し数は呼び出し側（パイプラインの要約段のワーカー数）で制限する。
+    """
     try:
         # テキストを切り詰める
         truncated_text = truncate_text(text)
         
         # プロンプトを作成
         logging.info(f"論文 '{title}' のプロンプトを作成中...")
-        prompt = prompt_template.format(論文テキスト=truncated_text)
+        prefix, suffix = compile_prompt_template(prompt_template)
+        prompt = f"{prefix}{truncated_text}{suffix}"
         logging.info(f"プロンプト作成完了（文字数: {len(prompt)}文字）")
         
         # OpenAI APIを呼び出し
@@ -44,8 +98,8 @@ def generate_summary(client, text, prompt_template, summary_dir, title, arxiv_id
                 logging.info(f"OpenAI APIを呼び出し中... (試行: {retry_count}/{max_retries})")
                 start_time = time.time()
                 
-                response = client.chat.completions.create(
-                    model="gpt-4o-mini",
+                response = await client.chat.completions.create(
+                    model=MODEL,
                     messages=[
                         {"role": "system", "content": "あなたは研究者です。"},
                         {"role": "user", "content": prompt}
@@ -68,7 +122,7 @@ def generate_summary(client, text, prompt_template, summary_dir, title, arxiv_id
                 # 要約文を作成（URLを先頭に、その後にgreetingを追加）
                 summary = f"{arxiv_url} C(・ω・ )つ みんなー！{summary}"
                 
-                # 要約結果をJSONファイルに保存
+                # 要約結果を返す（ファイルへの保存は呼び出し側でまとめて行う）
                 result = {
                     'title': title,
                     'arxiv_id': arxiv_id,
@@ -76,25 +130,14 @@ def generate_summary(client, text, prompt_template, summary_dir, title, arxiv_id
                     'summary': summary,
                 }
                 
-                # サマリーディレクトリを作成
-                os.makedirs(summary_dir, exist_ok=True)
-                
-                # ファイル名を作成
-                summary_file = os.path.join(summary_dir, f"{arxiv_id}_summary.json")
-                logging.info(f"要約結果をファイルに保存中: {summary_file}")
-                
-                # JSONファイルに保存
-                with open(summary_file, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, ensure_ascii=False, indent=2)
-                
-                logging.info(f"要約生成・保存完了: {summary_file}")
+                logging.info(f"要約生成完了: {arxiv_id}")
                 
                 return result
             
             except Exception as e:
                 logging.warning(f"APIエラーが発生しました: {str(e)}。{backoff_time}秒後にリトライします。({retry_count}/{max_retries})")
                 if retry_count < max_retries:
-                    time.sleep(backoff_time)
+                    await asyncio.sleep(backoff_time)
                     backoff_time *= 2
                 else:
                     logging.error(f"要約生成エラー: {str(e)}")
@@ -2,7 +2,8 @@
 # -*- coding: utf-8 -*-
 
 import arxiv
-import requests
+import aiohttp
+import asyncio
 import os
 import sys
 import time
@@ -10,13 +11,57 @@ import argparse
 import yaml
 import logging
 import json
+import re
+import glob
+import hashlib
+import functools
+import shutil
+import tarfile
+import threading
 from pathlib import Path
-from urllib.parse import urlparse
-from openai import OpenAI
+from openai import AsyncOpenAI
+from aiolimiter import AsyncLimiter
+from selectolax.parser import HTMLParser
 
 # 追加モジュールをインポート
 from pdf_processor import extract_text_from_pdf
-from ai_summarizer import generate_summary
+from ai_summarizer import generate_summary, MODEL
+
+# ダウンロード時のチャンクサイズ（バイト）
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# ダウンロードのリトライ回数とバックオフの基準時間（秒）
+DOWNLOAD_MAX_RETRIES = 3
+DOWNLOAD_BACKOFF = 0.5
+
+# arXivへのダウンロードリクエストのレート制限（トークンバケット、arXivの推奨である3秒に1リクエスト）
+# 前の論文の抽出や要約に3秒以上かかっていれば、次のダウンロードは待たずに開始される
+_ARXIV_LIMITER = AsyncLimiter(max_rate=1, time_period=3)
+
+# arXivのバルクダウンロード用S3バケット（リクエスタ支払い）
+ARXIV_BULK_BUCKET = 'arxiv'
+
+# PDFのURLの末尾からarXiv IDを取り出す（例: https://arxiv.org/pdf/2401.12345v1.pdf）
+_ARXIV_ID_RE = re.compile(r'([^/]+?)(?:\.pdf)?$')
+
+# arXivのHTML版のURL（新しい投稿にも対応しているarXiv本体のHTML版を使う）
+ARXIV_HTML_URL = "https://arxiv.org/html/{arxiv_id}"
+
+# HTML版から取り出した本文がこれより短い場合は変換に失敗したとみなす
+HTML_MIN_TEXT_LENGTH = 1000
+
+# HTML版の本文から除外する要素
+_HTML_EXCLUDE_SELECTORS = "script, style, nav, header, footer, .ltx_bibliography, .ltx_page_footer"
+
+# 新形式のarXiv ID（例: 2401.12345v1）から年月を取り出す
+_NEW_STYLE_ID_RE = re.compile(r'^(\d{4})\.\d{4,5}(v\d+)?$')
+
+# 年月ごとのバルク取得を直列化するロック
+_BULK_LOCKS = {}
+_BULK_LOCKS_LOCK = threading.Lock()
+
+# バルク取得に失敗した年月（プロセスの実行中は再取得せずHTTPでダウンロードする）
+_BULK_FAILED_MONTHS = set()
 
 def load_config():
     """
@@ -54,13 +99,109 @@ def extract_arxiv_id(paper):
     Returns:
         str: arXiv ID
     """
-    pdf_url = paper.pdf_url
-    parsed_url = urlparse(pdf_url)
-    path_parts = parsed_url.path.split('/')
-    arxiv_id = path_parts[-1]
-    if arxiv_id.endswith('.pdf'):
-        arxiv_id = arxiv_id[:-4]
-    return arxiv_id
+    return _ARXIV_ID_RE.search(paper.pdf_url).group(1)
+
+@functools.lru_cache(maxsize=1)
+def _arxiv_client():
+    """arXiv APIクライアントを取得する（実行中は同じクライアントを共有）"""
+    return arxiv.Client(
+        page_size=100,  # 一度に取得する論文数を増やす
+        delay_seconds=1.0,  # リクエスト間の待機時間を1秒に短縮
+        num_retries=3  # リトライ回数
+    )
+
+@functools.lru_cache(maxsize=None)
+def get_openai_client(api_key):
+    """OpenAIクライアントを取得する（APIキーごとに同じクライアントを共有）"""
+    return AsyncOpenAI(api_key=api_key)
+
+def create_http_session():
+    """
+    PDFダウンロード用のHTTPセッションを作成する
+    
+    同じセッションを使い回すことで、arxiv.orgへのTCP/TLS接続がkeep-aliveで再利用される。
+    
+    Returns:
+        aiohttp.ClientSession: HTTPセッション
+    """
+    connector = aiohttp.TCPConnector(limit=20, limit_per_host=20)
+    timeout = aiohttp.ClientTimeout(sock_connect=5, sock_read=60)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+def get_summary_cache_key(arxiv_id, prompt_template, model=MODEL):
+    """
+    要約キャッシュのキーを生成する
+    
+    プロンプトテンプレートやモデルが変わるとキーも変わるため、古い要約は自動的に無効になる。
+    
+    Args:
+        arxiv_id (str): arXiv ID
+        prompt_template (str): プロンプトテンプレート
+        model (str): 要約に使用するモデル
+        
+    Returns:
+        str: キャッシュキー
+    """
+    return hashlib.sha256((arxiv_id + prompt_template + model).encode('utf-8')).hexdigest()[:16]
+
+def get_summary_marker_path(summary_dir, arxiv_id, cache_key):
+    """要約の完了マーカーのパスを取得する"""
+    return os.path.join(summary_dir, f"{arxiv_id}.{cache_key}.done")
+
+def get_summary_path(summary_dir, arxiv_id):
+    """サマリーファイルのパスを取得する"""
+    return os.path.join(summary_dir, f"{arxiv_id}_summary.json")
+
+def write_summary_marker(summary_dir, arxiv_id, cache_key):
+    """要約の完了マーカーを作成する（古いキャッシュキーのマーカーは削除）"""
+    marker_path = get_summary_marker_path(summary_dir, arxiv_id, cache_key)
+    for old_marker in glob.glob(os.path.join(glob.escape(summary_dir), f"{glob.escape(arxiv_id)}.*.done")):
+        if old_marker != marker_path:
+            os.remove(old_marker)
+    with open(marker_path, 'w') as f:
+        pass
+
+def is_summary_cached(summary_dir, arxiv_id, cache_key):
+    """
+    現在のキャッシュキーで要約が完了しているか確認する
+    
+    完了マーカーを導入する前に作成されたサマリー（マーカーが一つもないもの）は
+    完了済みとみなし、現在のキャッシュキーでマーカーを作成する。
+    """
+    if os.path.exists(get_summary_marker_path(summary_dir, arxiv_id, cache_key)):
+        return True
+    if (os.path.exists(get_summary_path(summary_dir, arxiv_id)) and
+            not glob.glob(os.path.join(glob.escape(summary_dir), f"{glob.escape(arxiv_id)}.*.done"))):
+        write_summary_marker(summary_dir, arxiv_id, cache_key)
+        return True
+    return False
+
+def _read_summary_timestamp(summary_path):
+    """既存のサマリーファイルのタイムスタンプを取得する（ない場合はNone）"""
+    try:
+        with open(summary_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('timestamp')
+    except FileNotFoundError:
+        return None
+    except (ValueError, OSError, AttributeError) as e:
+        logging.warning(f"既存のサマリーファイルの読み込みエラー: {summary_path} - {str(e)}")
+        return None
+
+def write_json_atomic(path, data, indent=None):
+    """
+    JSONファイルをアトミックに書き込む
+    
+    一時ファイルに書き込んでから置き換えるため、途中でクラッシュしても書きかけのファイルが残らない。
+    indentを指定しない場合はプログラムからのみ読む想定で、区切り文字を詰めて出力する。
+    """
+    if indent is None:
+        content = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    else:
+        content = json.dumps(data, ensure_ascii=False, indent=indent)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
 
 def search_arxiv(keywords, max_results=100, use_or=False, since_timestamp=None, last_paper_id=None):
     """
@@ -88,12 +229,8 @@ def search_arxiv(keywords, max_results=100, use_or=False, since_timestamp=None,
         logging.info(f"タイムスタンプフィルタを適用: {since_timestamp} 以降")
         logging.info(f"最終的な検索クエリ: {query}")
     
-    # arXivクライアントを作成
-    client = arxiv.Client(
-        page_size=100,  # 一度に取得する論文数を増やす
-        delay_seconds=1.0,  # リクエスト間の待機時間を1秒に短縮
-        num_retries=3  # リトライ回数
-    )
+    # arXivクライアントを取得
+    client = _arxiv_client()
     
     # デフォルトのタイムスタンプフィルタ（30日前から）
     if not since_timestamp:
@@ -126,7 +263,7 @@ def search_arxiv(keywords, max_results=100, use_or=False, since_timestamp=None,
     
     return results
 
-def download_pdf(paper, download_dir, force_download=False):
+async def download_pdf(paper, download_dir, force_download=False, session=None):
     """
     論文のPDFをダウンロードします。
     
@@ -134,6 +271,7 @@ def download_pdf(paper, download_dir, force_download=False):
         paper (arxiv.Result): 論文情報
         download_dir (str): ダウンロード先ディレクトリ
         force_download (bool): 既存のファイルを上書きするかどうか
+        session (aiohttp.ClientSession, optional): 共有するHTTPセッション。指定しない場合はこの呼び出し用に作成する
     
     Returns:
         tuple: (成功したかどうか, ダウンロードパス, arXiv ID)
@@ -142,14 +280,8 @@ def download_pdf(paper, download_dir, force_download=False):
     pdf_url = paper.pdf_url
     
     # ファイル名を作成（arXiv IDを使用）
-    parsed_url = urlparse(pdf_url)
-    path_parts = parsed_url.path.split('/')
-    arxiv_id = path_parts[-1]
-    if not arxiv_id.endswith('.pdf'):
-        arxiv_id = f"{arxiv_id}.pdf"
-    
-    # arXiv IDから拡張子を除去（処理済みチェック用）
-    arxiv_id_without_ext = os.path.splitext(arxiv_id)[0]
+    arxiv_id_without_ext = extract_arxiv_id(paper)
+    arxiv_id = f"{arxiv_id_without_ext}.pdf"
     
     # ダウンロード先のパスを作成
     download_path = os.path.join(download_dir, arxiv_id)
@@ -163,85 +295,274 @@ def download_pdf(paper, download_dir, force_download=False):
         # PDFをダウンロード
         logging.info(f"ダウンロード中: {paper.title} ({arxiv_id})")
         
-        # arXivサーバーに負荷をかけないよう、ダウンロード前に待機
-        time.sleep(5)  # 5秒待機
-        
-        response = requests.get(pdf_url)
-        response.raise_for_status()
-        
-        # ファイルに保存
-        with open(download_path, 'wb') as f:
-            f.write(response.content)
+        # PDFをチャンク単位でストリーミングしながら一時ファイルに保存
+        # （中断時に不完全なファイルが既存ファイルとして扱われないようにする）
+        tmp_path = f"{download_path}.part"
+        own_session = session is None
+        if own_session:
+            session = create_http_session()
+        try:
+            for attempt in range(1, DOWNLOAD_MAX_RETRIES + 1):
+                try:
+                    # arXivサーバーに負荷をかけないよう、レート制限内でリクエスト
+                    async with _ARXIV_LIMITER:
+                        response = await session.get(pdf_url)
+                    async with response:
+                        response.raise_for_status()
+                        # チャンクをPythonのバッファにコピーせず、そのままwrite()に渡す
+                        # （バッファなしのwrite()は一部しか書き込まないことがあるため、残りを書き込み続ける）
+                        with open(tmp_path, 'wb', buffering=0) as f:
+                            async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                                view = memoryview(chunk)
+                                while view:
+                                    view = view[f.write(view):]
+                    break
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    # クライアントエラー（4xx）はリトライしない
+                    if isinstance(e, aiohttp.ClientResponseError) and e.status < 500:
+                        raise
+                    if attempt == DOWNLOAD_MAX_RETRIES:
+                        raise
+                    backoff_time = DOWNLOAD_BACKOFF * (2 ** (attempt - 1))
+                    logging.warning(f"ダウンロードエラー: {arxiv_id} - {str(e)}。{backoff_time}秒後にリトライします。({attempt}/{DOWNLOAD_MAX_RETRIES})")
+                    await asyncio.sleep(backoff_time)
+        finally:
+            if own_session:
+                await session.close()
+        os.replace(tmp_path, download_path)
         
         logging.info(f"ダウンロード完了: {download_path}")
         
-        # ダウンロード後も少し待機
-        time.sleep(2)  # 2秒待機
-        
         return True, download_path, arxiv_id_without_ext
     
     except Exception as e:
         logging.error(f"ダウンロード失敗: {arxiv_id} - エラー: {str(e)}")
         return False, None, arxiv_id_without_ext
 
-def process_paper(paper, dirs, openai_client, config, force_process=False, skip_twitter=False, summary_dir=None):
+def _fetch_bulk_month(yymm, bulk_dir, download_dir):
     """
-    論文を処理する（ダウンロード、テキスト抽出、要約生成）
+    指定した年月のPDFアーカイブをS3から取得して展開する
+    
+    Args:
+        yymm (str): 年月（例: 2401）
+        bulk_dir (str): PDFの展開先ディレクトリ
+        download_dir (str): アーカイブの一時保存先ディレクトリ
+    """
+    # boto3はバルクモードでのみ必要なため、ここでインポートする
+    import boto3
+    
+    s3 = boto3.client('s3')
+    os.makedirs(bulk_dir, exist_ok=True)
+    
+    # 対象年月のアーカイブ一覧を取得
+    prefix = f"pdf/arXiv_pdf_{yymm}_"
+    paginator = s3.get_paginator('list_objects_v2')
+    keys = []
+    for page in paginator.paginate(Bucket=ARXIV_BULK_BUCKET, Prefix=prefix, RequestPayer='requester'):
+        keys.extend(obj['Key'] for obj in page.get('Contents', []))
+    logging.info(f"バルクアーカイブ数: {len(keys)}件（{yymm}）")
+    
+    for key in sorted(keys):
+        tar_path = os.path.join(download_dir, os.path.basename(key))
+        logging.info(f"バルクアーカイブをダウンロード中: s3://{ARXIV_BULK_BUCKET}/{key}")
+        s3.download_file(ARXIV_BULK_BUCKET, key, tar_path, ExtraArgs={'RequestPayer': 'requester'})
+        try:
+            # アーカイブ内のパスは使わず、ファイル名だけで展開する
+            with tarfile.open(tar_path) as tar:
+                for member in tar:
+                    if not member.isfile() or not member.name.endswith('.pdf'):
+                        continue
+                    src = tar.extractfile(member)
+                    with open(os.path.join(bulk_dir, os.path.basename(member.name)), 'wb') as f:
+                        shutil.copyfileobj(src, f)
+        finally:
+            os.remove(tar_path)
+    
+    # 展開完了マーカーを作成
+    with open(os.path.join(bulk_dir, '.complete'), 'w') as f:
+        pass
+
+def download_pdf_bulk(arxiv_id, download_dir):
+    """
+    arXivのS3バルクアーカイブからPDFを取得します。
+    
+    初回は対象年月のアーカイブをまとめて取得・展開し、以降は展開済みのファイルを返します。
+    
+    Args:
+        arxiv_id (str): arXiv ID
+        download_dir (str): ダウンロード先ディレクトリ
+    
+    Returns:
+        tuple: (成功したかどうか, PDFのパス)
+    """
+    match = _NEW_STYLE_ID_RE.match(arxiv_id)
+    if not match:
+        # 旧形式のIDはバルクモードの対象外
+        return False, None
+    yymm = match.group(1)
+    bulk_dir = os.path.join(download_dir, yymm)
+    
+    with _BULK_LOCKS_LOCK:
+        lock = _BULK_LOCKS.setdefault(yymm, threading.Lock())
+    with lock:
+        # 失敗した年月のアーカイブを論文ごとに取得し直さないようにする
+        if yymm in _BULK_FAILED_MONTHS:
+            return False, None
+        try:
+            if not os.path.exists(os.path.join(bulk_dir, '.complete')):
+                _fetch_bulk_month(yymm, bulk_dir, download_dir)
+        except Exception as e:
+            _BULK_FAILED_MONTHS.add(yymm)
+            logging.error(f"バルクアーカイブの取得失敗: {yymm} - エラー: {str(e)}（この年月は以降バルクモードを使用しません）")
+            return False, None
+    
+    # バージョン指定がない場合は最新バージョンを使用
+    if match.group(2):
+        pdf_path = os.path.join(bulk_dir, f"{arxiv_id}.pdf")
+    else:
+        candidates = glob.glob(os.path.join(glob.escape(bulk_dir), f"{glob.escape(arxiv_id)}v*.pdf"))
+        candidates.sort(key=lambda path: int(re.search(r'v(\d+)\.pdf$', path).group(1)))
+        pdf_path = candidates[-1] if candidates else os.path.join(bulk_dir, f"{arxiv_id}.pdf")
+    
+    if not os.path.exists(pdf_path):
+        return False, None
+    return True, pdf_path
+
+async def fetch_paper_pdf(paper, dirs, config, http_session=None):
+    """
+    論文のPDFを取得する（パイプラインのダウンロード段）
     
     Args:
         paper (arxiv.Result): 論文情報
         dirs (dict): ディレクトリパス
-        openai_client (OpenAI): OpenAIクライアント
         config (dict): 設定情報
-        force_process (bool): 処理済みの論文も強制的に処理するかどうか
-        skip_twitter (bool): Twitter投稿をスキップするかどうか
-        summary_dir (str, optional): カスタムサマリーディレクトリ。指定しない場合はdirs['summary']を使用
+        http_session (aiohttp.ClientSession, optional): PDFダウンロードで共有するHTTPセッション
     
     Returns:
-        bool: 処理が成功したかどうか
+        tuple: (PDFのパス, arXiv ID)。失敗した場合はNone
     """
-    # サマリーディレクトリを設定
-    if summary_dir is None:
-        summary_dir = dirs['summary']
-    # 1. PDFをダウンロード
     logging.info(f"論文 '{paper.title}' のPDFをダウンロード中...")
     start_time = time.time()
-    success, pdf_path, arxiv_id = download_pdf(paper, dirs['dl'])
+    success = False
+    if config.get('bulk_mode'):
+        # バルクモードではS3アーカイブから取得し、見つからない場合は通常のダウンロードに切り替える
+        arxiv_id = extract_arxiv_id(paper)
+        success, pdf_path = await asyncio.to_thread(download_pdf_bulk, arxiv_id, dirs['dl'])
+    if not success:
+        success, pdf_path, arxiv_id = await download_pdf(paper, dirs['dl'], session=http_session)
     end_time = time.time()
     if not success:
         logging.error(f"論文 '{paper.title}' のPDFダウンロードに失敗しました")
-        return False
+        return None
     logging.info(f"論文 '{paper.title}' のPDFダウンロードが完了しました（所要時間: {end_time - start_time:.2f}秒）")
+    return pdf_path, arxiv_id
+
+async def fetch_html_text(paper, session):
+    """
+    arXivのHTML版から論文の本文テキストを取得する
+    
+    PDFのダウンロードとテキスト抽出を省略できるため、HTML版がある論文はこちらを優先する。
+    
+    Args:
+        paper (arxiv.Result): 論文情報
+        session (aiohttp.ClientSession): 共有するHTTPセッション
     
-    # 2. PDFからテキストを抽出
+    Returns:
+        str: 本文テキスト。HTML版がない場合や取得に失敗した場合はNone
+    """
+    arxiv_id = extract_arxiv_id(paper)
+    url = ARXIV_HTML_URL.format(arxiv_id=arxiv_id)
+    logging.info(f"論文 '{paper.title}' のHTML版を取得中: {url}")
+    start_time = time.time()
+    try:
+        # PDFのダウンロードと同じarXivのサーバーのため、同じレート制限内でリクエスト
+        async with _ARXIV_LIMITER:
+            response = await session.get(url, allow_redirects=False)
+        async with response:
+            # HTML版がない論文は404またはリダイレクトになるため、リダイレクト先は取得しない
+            if response.status == 404 or 300 <= response.status < 400:
+                logging.info(f"論文 '{paper.title}' のHTML版はありません。PDFを使用します")
+                return None
+            response.raise_for_status()
+            html = await response.text()
+    except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+        logging.warning(f"HTML版の取得失敗: {arxiv_id} - エラー: {str(e)}。PDFを使用します")
+        return None
+    
+    # 本文部分だけを取り出す（解析に失敗した場合もPDFにフォールバックする）
+    try:
+        tree = HTMLParser(html)
+        for node in tree.css(_HTML_EXCLUDE_SELECTORS):
+            node.decompose()
+        article = tree.css_first('article') or tree.body
+        text = article.text(separator='\n', strip=True) if article is not None else ''
+    except Exception as e:
+        logging.warning(f"HTML版の解析失敗: {arxiv_id} - エラー: {str(e)}。PDFを使用します")
+        return None
+    if len(text) < HTML_MIN_TEXT_LENGTH:
+        logging.info(f"論文 '{paper.title}' のHTML版の本文が短すぎます（{len(text)}文字）。PDFを使用します")
+        return None
+    
+    end_time = time.time()
+    logging.info(f"論文 '{paper.title}' のHTML版の取得が完了しました（文字数: {len(text)}文字、所要時間: {end_time - start_time:.2f}秒）")
+    return text
+
+async def extract_paper_text(paper, pdf_path):
+    """
+    PDFからテキストを抽出する（パイプラインの抽出段）
+    
+    Args:
+        paper (arxiv.Result): 論文情報
+        pdf_path (str): PDFのパス
+    
+    Returns:
+        str: 抽出したテキスト。失敗した場合はNone
+    """
+    # ブロッキング処理のため別スレッドで実行
     logging.info(f"論文 '{paper.title}' のテキスト抽出中...")
     start_time = time.time()
-    text_path = extract_text_from_pdf(pdf_path, dirs['text'])
+    paper_text = await asyncio.to_thread(extract_text_from_pdf, pdf_path)
     end_time = time.time()
-    if not text_path:
+    if paper_text is None:
         logging.error(f"論文 '{paper.title}' のテキスト抽出に失敗しました")
-        return False
+        return None
     logging.info(f"論文 '{paper.title}' のテキスト抽出が完了しました（所要時間: {end_time - start_time:.2f}秒）")
-    
-    # 3. テキストを読み込み
-    with open(text_path, 'r', encoding='utf-8') as f:
-        paper_text = f.read()
+    return paper_text
 
-    # 4. 要約を生成
+async def summarize_paper(paper, arxiv_id, paper_text, dirs, openai_client, config, summary_dir=None):
+    """
+    論文の要約を生成して保存する（パイプラインの要約段）
+    
+    Args:
+        paper (arxiv.Result): 論文情報
+        arxiv_id (str): arXiv ID
+        paper_text (str): 論文のテキスト
+        dirs (dict): ディレクトリパス
+        openai_client (AsyncOpenAI): OpenAIクライアント
+        config (dict): 設定情報
+        summary_dir (str, optional): カスタムサマリーディレクトリ。指定しない場合はdirs['summary']を使用
+    
+    Returns:
+        dict: 保存したサマリーデータ。失敗した場合はNone
+    """
+    # サマリーディレクトリを設定
+    if summary_dir is None:
+        summary_dir = dirs['summary']
+    
+    # 要約を生成（同時実行数はパイプラインの要約段のワーカー数で制限される）
     logging.info(f"論文 '{paper.title}' の要約を生成中...")
     start_time = time.time()
-    summary = generate_summary(
+    summary = await generate_summary(
         openai_client,
         paper_text,
         config['prompt']['template'],
-        summary_dir,
         paper.title,
         arxiv_id
     )
     end_time = time.time()
     if not summary:
         logging.error(f"論文 '{paper.title}' の要約生成に失敗しました")
-        return False
+        return None
     
     logging.info(f"論文 '{paper.title}' の要約生成が完了しました（所要時間: {end_time - start_time:.2f}秒）")
     
@@ -262,22 +583,32 @@ def process_paper(paper, dirs, openai_client, config, force_process=False, skip_
         summary['post_text'] = post_text
     
     # サマリーファイルを生成
-    summary_path = os.path.join(summary_dir, f"{arxiv_id}_summary.json")
+    # 再要約の場合は元のタイムスタンプを引き継ぐ（Webページで同じ日付のページに掲載し続けるため）
+    summary_path = get_summary_path(summary_dir, arxiv_id)
+    timestamp = _read_summary_timestamp(summary_path) or time.strftime("%Y-%m-%d %H:%M:%S")
     summary_data = {
         "title": paper.title,
-        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "timestamp": timestamp,
         "keywords": " ".join([k for k in paper.categories if k]),  # 論文のカテゴリ情報を保存
         "summary": summary['summary'],
         "post_text": summary['post_text'],
         "arxiv_id": arxiv_id
     }
     
-    with open(summary_path, 'w', encoding='utf-8') as f:
-        json.dump(summary_data, f, ensure_ascii=False, indent=2)
+    write_json_atomic(summary_path, summary_data, indent=2)
     
-    # ログファイルを生成
+    # ログファイルを生成（内容はサマリーと同じため、ハードリンクで同じファイルを共有する）
     log_path = os.path.join(dirs['logs'], f"{arxiv_id}_log.json")
-    with open(log_path, 'w', encoding='utf-8') as f:
-        json.dump(summary_data, f, ensure_ascii=False, indent=2)
+    if os.path.lexists(log_path):
+        os.remove(log_path)
+    try:
+        os.link(summary_path, log_path)
+    except OSError:
+        # ファイルシステムが異なる場合などハードリンクできないときはコピーする
+        shutil.copyfile(summary_path, log_path)
+    
+    # 完了マーカーを作成（古いキャッシュキーのマーカーは削除）
+    cache_key = get_summary_cache_key(arxiv_id, config['prompt']['template'])
+    write_summary_marker(summary_dir, arxiv_id, cache_key)
     
-    return True
+    return summary_data
@@ -5,15 +5,19 @@ import os
 import sys
 import yaml
 import time
+import asyncio
 import logging
 import argparse
 from datetime import datetime, timedelta
 import json
+import sqlite3
 from pathlib import Path
 import arxiv
 
 # 追加モジュールをインポート
-from arxiv_downloader import search_arxiv, process_paper, OpenAI, setup_directories, extract_arxiv_id
+from arxiv_downloader import search_arxiv, fetch_html_text, fetch_paper_pdf, extract_paper_text, summarize_paper, get_openai_client, setup_directories, extract_arxiv_id, get_summary_cache_key, is_summary_cached, create_http_session
+from ai_summarizer import compile_prompt_template
+from pdf_processor import shutdown_executor as shutdown_pdf_executor
 from web_generator import generate_webpage
 
 def setup_logging():
@@ -47,43 +51,148 @@ def load_config():
         logging.error(f"設定ファイルの読み込みエラー: {str(e)}")
         sys.exit(1)
 
-def load_cache(cache_dir, cache_type):
-    """キャッシュを読み込む"""
-    cache_file = os.path.join(cache_dir, f"{cache_type}_cache.json")
-    if os.path.exists(cache_file):
-        try:
-            with open(cache_file, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logging.warning(f"キャッシュファイルの読み込みエラー: {str(e)}")
-    return {}
-
-def save_cache(cache_dir, cache_type, cache_data):
-    """キャッシュを保存"""
-    cache_file = os.path.join(cache_dir, f"{cache_type}_cache.json")
+def open_cache(cache_dir):
+    """
+    キャッシュDBを開く（存在しない場合はテーブルを作成）
+    
+    Args:
+        cache_dir (str): キャッシュディレクトリ
+        
+    Returns:
+        sqlite3.Connection: キャッシュDBへの接続
+    """
+    conn = sqlite3.connect(os.path.join(cache_dir, 'cache.db'), isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS papers (
+            id TEXT PRIMARY KEY,
+            title TEXT,
+            summary TEXT,
+            pdf_url TEXT,
+            published TEXT,
+            updated TEXT,
+            post_text TEXT,
+            processed_at TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS searches (
+            key TEXT PRIMARY KEY,
+            ids_json TEXT,
+            created_at TEXT
+        )
+    """)
+    return conn
+
+def load_search_cache(conn, search_key):
+    """
+    検索キャッシュを読み込む
+    
+    Args:
+        conn (sqlite3.Connection): キャッシュDBへの接続
+        search_key (str): 検索キャッシュのキー
+        
+    Returns:
+        list: 論文情報の辞書のリスト。キャッシュがない場合はNone
+    """
     try:
-        # arxiv.Resultオブジェクトを辞書に変換
-        if cache_type == "search":
-            serializable_data = []
-            for paper in cache_data:
-                if isinstance(paper, arxiv.Result):
-                    paper_dict = {
-                        'id': extract_arxiv_id(paper),
-                        'title': paper.title,
-                        'summary': paper.summary,
-                        'pdf_url': paper.pdf_url,
-                        'published': paper.published.isoformat(),
-                        'updated': paper.updated.isoformat()
-                    }
-                else:
-                    paper_dict = paper
-                serializable_data.append(paper_dict)
-            cache_data = serializable_data
-
-        with open(cache_file, 'w') as f:
-            json.dump(cache_data, f, indent=2)
-    except Exception as e:
-        logging.error(f"キャッシュファイルの保存エラー: {str(e)}")
+        row = conn.execute("SELECT ids_json FROM searches WHERE key = ?", (search_key,)).fetchone()
+        if row is None:
+            return None
+        paper_ids = json.loads(row[0])
+        rows = conn.execute(
+            "SELECT id, title, summary, pdf_url, published, updated FROM papers "
+            "WHERE id IN (SELECT value FROM json_each(?))",
+            (row[0],)
+        ).fetchall()
+    except sqlite3.Error as e:
+        logging.warning(f"キャッシュの読み込みエラー: {str(e)}")
+        return None
+
+    papers = {
+        r[0]: {'id': r[0], 'title': r[1], 'summary': r[2], 'pdf_url': r[3], 'published': r[4], 'updated': r[5]}
+        for r in rows
+    }
+    # 論文情報が欠けている場合はキャッシュなしとして扱う
+    if any(paper_id not in papers for paper_id in paper_ids):
+        return None
+    return [papers[paper_id] for paper_id in paper_ids]
+
+def save_search_cache(conn, search_key, results):
+    """
+    検索結果をキャッシュに保存
+    
+    Args:
+        conn (sqlite3.Connection): キャッシュDBへの接続
+        search_key (str): 検索キャッシュのキー
+        results (list): 検索結果の論文リスト（arxiv.Result）
+    """
+    rows = [
+        (
+            extract_arxiv_id(paper),
+            paper.title,
+            paper.summary,
+            paper.pdf_url,
+            paper.published.isoformat(),
+            paper.updated.isoformat()
+        )
+        for paper in results
+    ]
+    try:
+        conn.execute("BEGIN")
+        conn.executemany("""
+            INSERT INTO papers (id, title, summary, pdf_url, published, updated)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                title = excluded.title,
+                summary = excluded.summary,
+                pdf_url = excluded.pdf_url,
+                published = excluded.published,
+                updated = excluded.updated
+        """, rows)
+        conn.execute(
+            "INSERT OR REPLACE INTO searches (key, ids_json, created_at) VALUES (?, ?, ?)",
+            (search_key, json.dumps([row[0] for row in rows]), datetime.now().isoformat())
+        )
+        conn.execute("COMMIT")
+    except sqlite3.Error as e:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        logging.error(f"キャッシュの保存エラー: {str(e)}")
+
+def save_paper_cache(conn, paper_id, paper, post_text):
+    """
+    処理済みの論文をキャッシュに保存
+    
+    Args:
+        conn (sqlite3.Connection): キャッシュDBへの接続
+        paper_id (str): arXiv ID
+        paper (arxiv.Result): 論文情報
+        post_text (str): 投稿テキスト
+    """
+    try:
+        conn.execute("""
+            INSERT INTO papers (id, title, summary, pdf_url, published, updated, post_text, processed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                title = excluded.title,
+                summary = excluded.summary,
+                pdf_url = excluded.pdf_url,
+                post_text = excluded.post_text,
+                processed_at = excluded.processed_at
+        """, (
+            paper_id,
+            paper.title,
+            paper.summary,
+            paper.pdf_url,
+            paper.published.isoformat(),
+            paper.updated.isoformat(),
+            post_text,
+            datetime.now().isoformat()
+        ))
+    except sqlite3.Error as e:
+        logging.error(f"キャッシュの保存エラー: {str(e)}")
 
 def get_cache_key(data_type, **kwargs):
     """キャッシュキーを生成"""
@@ -92,11 +201,121 @@ def get_cache_key(data_type, **kwargs):
         keywords_str = "_".join(sorted(kwargs.get('keywords', [])))
         timestamp = kwargs.get('timestamp', '')
         return f"search_{keywords_str}_{timestamp}"
-    elif data_type == "paper":
-        # 論文IDからキーを生成
-        return f"paper_{kwargs.get('paper_id', '')}"
     return None
 
+async def process_papers(results, dirs, openai_client, config, summary_dir, cache_conn, force=False):
+    """
+    論文をパイプラインで並行して処理する（ダウンロード → テキスト抽出 → 要約生成）
+    
+    HTML版がある論文はダウンロード段で本文を取得し、テキスト抽出段を飛ばして要約段へ送る。
+    
+    各段は別々のワーカー群がキューでつながっており、ダウンロード（ネットワーク）、
+    テキスト抽出（CPU）、要約生成（OpenAI API）が異なる論文について同時に進む。
+    
+    Args:
+        results (list): 検索結果の論文リスト
+        dirs (dict): ディレクトリパス
+        openai_client (AsyncOpenAI): OpenAIクライアント
+        config (dict): 設定情報
+        summary_dir (str): サマリーディレクトリ
+        cache_conn (sqlite3.Connection): キャッシュDBへの接続
+        force (bool): キャッシュを無視して強制的に再処理するかどうか
+    
+    Returns:
+        list: 処理に成功した論文情報のリスト
+    """
+    # 各段のワーカー数（要約段はOpenAI APIの同時呼び出し数に合わせる）
+    execution_config = config.get('execution', {})
+    download_workers = execution_config.get('download_workers', 8)
+    extract_workers = execution_config.get('extract_workers', os.cpu_count())
+    summarize_workers = config.get('openai', {}).get('max_concurrent_requests', 10)
+    processed_papers = []
+
+    # 重複した論文と要約済みの論文を除外してから処理を割り当てる
+    seen_ids = set()
+    to_download = asyncio.Queue()
+    for paper in results:
+        paper_id = extract_arxiv_id(paper)
+        if paper_id in seen_ids:
+            continue
+        seen_ids.add(paper_id)
+
+        # 現在のプロンプトとモデルで要約が完了しているか確認
+        cache_key = get_summary_cache_key(paper_id, config['prompt']['template'])
+        if not force and is_summary_cached(summary_dir, paper_id, cache_key):
+            logging.info(f"論文キャッシュを使用: {paper_id}")
+            continue
+        to_download.put_nowait((paper_id, paper))
+    logging.info(f"処理対象の論文数: {to_download.qsize()}件（検索結果: {len(results)}件）")
+
+    to_extract = asyncio.Queue()
+    to_summarize = asyncio.Queue()
+
+    async def run_stage(in_queue, handle):
+        """キューから論文を取り出して処理し続けるワーカー"""
+        while True:
+            paper_id, *item = await in_queue.get()
+            try:
+                await handle(paper_id, *item)
+            except Exception as e:
+                logging.error(f"論文処理エラー: {paper_id} - {str(e)}")
+            finally:
+                in_queue.task_done()
+
+    async def download(paper_id, paper):
+        logging.info(f"論文を処理中: {paper_id}")
+        # HTML版があればPDFのダウンロードとテキスト抽出を省略する
+        if config.get('prefer_html', True):
+            paper_text = await fetch_html_text(paper, http_session)
+            if paper_text is not None:
+                to_summarize.put_nowait((paper_id, paper, paper_id, paper_text))
+                return
+        fetched = await fetch_paper_pdf(paper, dirs, config, http_session=http_session)
+        if fetched is not None:
+            pdf_path, arxiv_id = fetched
+            to_extract.put_nowait((paper_id, paper, pdf_path, arxiv_id))
+
+    async def extract(paper_id, paper, pdf_path, arxiv_id):
+        paper_text = await extract_paper_text(paper, pdf_path)
+        if paper_text is not None:
+            to_summarize.put_nowait((paper_id, paper, arxiv_id, paper_text))
+
+    async def summarize(paper_id, paper, arxiv_id, paper_text):
+        summary_data = await summarize_paper(
+            paper,
+            arxiv_id,
+            paper_text,
+            dirs,
+            openai_client,
+            config,
+            summary_dir=summary_dir  # カスタムサマリーディレクトリを指定
+        )
+        if summary_data:
+            save_paper_cache(cache_conn, paper_id, paper, summary_data['post_text'])
+            processed_papers.append({
+                'id': paper_id,
+                'title': paper.title,
+                'summary': paper.summary,
+                'url': paper.pdf_url
+            })
+
+    # 各段のワーカーを起動（HTTP接続は全論文で共有）
+    async with create_http_session() as http_session:
+        workers = (
+            [asyncio.create_task(run_stage(to_download, download)) for _ in range(download_workers)]
+            + [asyncio.create_task(run_stage(to_extract, extract)) for _ in range(extract_workers)]
+            + [asyncio.create_task(run_stage(to_summarize, summarize)) for _ in range(summarize_workers)]
+        )
+        # 前段が終わってから次の段の完了を待つ
+        await to_download.join()
+        await to_extract.join()
+        await to_summarize.join()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    return processed_papers
+
 def main():
     """メイン関数"""
     # コマンドライン引数のパーサーを設定
@@ -134,6 +353,13 @@ def main():
     config = load_config()
     logging.info("設定ファイルを読み込みました")
 
+    # プロンプトテンプレートを検証（最初の論文の処理前にエラーを検出する）
+    try:
+        compile_prompt_template(config['prompt']['template'])
+    except ValueError as e:
+        logging.error(f"プロンプトテンプレートのエラー: {str(e)}")
+        sys.exit(1)
+
     # 出力ディレクトリを作成
     os.makedirs(args.output_dir, exist_ok=True)
     logging.info(f"出力ディレクトリを確認: {args.output_dir}")
@@ -142,9 +368,8 @@ def main():
     cache_dir = "./cache"
     os.makedirs(cache_dir, exist_ok=True)
 
-    # キャッシュを読み込む
-    search_cache = load_cache(cache_dir, "search")
-    paper_cache = load_cache(cache_dir, "paper")
+    # キャッシュDBを開く
+    cache_conn = open_cache(cache_dir)
 
     # 必要なディレクトリを設定
     dirs = setup_directories()
@@ -162,7 +387,7 @@ def main():
     logging.info(f"サマリーディレクトリを設定: {summary_dir}")
 
     # OpenAIクライアントを初期化
-    openai_client = OpenAI(api_key=config['openai']['api_key'])
+    openai_client = get_openai_client(config['openai']['api_key'])
 
     # 検索期間を設定
     days_back = config.get('search', {}).get('days_back', 30)
@@ -173,10 +398,11 @@ def main():
     search_key = get_cache_key("search", keywords=args.keywords, timestamp=since_timestamp)
 
     # 検索結果を取得（キャッシュがある場合はそれを使用）
-    if not args.force and search_key in search_cache:
+    cached_papers = None if args.force else load_search_cache(cache_conn, search_key)
+    if cached_papers is not None:
         logging.info("検索キャッシュを使用します")
         results = []
-        for paper_dict in search_cache[search_key]:
+        for paper_dict in cached_papers:
             # 辞書からarxiv.Resultオブジェクトを再構築
             paper = arxiv.Result(
                 entry_id=f"http://arxiv.org/abs/{paper_dict['id']}",
@@ -202,41 +428,23 @@ def main():
             since_timestamp=since_timestamp
         )
         # 検索結果をキャッシュに保存
-        save_cache(cache_dir, "search", results)
+        save_search_cache(cache_conn, search_key, results)
 
     # 各論文を処理
-    processed_papers = []
-    for paper in results:
-        paper_id = extract_arxiv_id(paper)
-        paper_key = get_cache_key("paper", paper_id=paper_id)
-
-        # サマリーファイルが存在するか確認
-        summary_file = os.path.join(summary_dir, f"{paper_id}_summary.json")
-        if os.path.exists(summary_file) and not args.force:
-            logging.info(f"論文キャッシュを使用: {paper_id}")
-            continue
-
-        # 論文を処理
-        logging.info(f"論文を処理中: {paper_id}")
-        success = process_paper(
-            paper,
+    try:
+        asyncio.run(process_papers(
+            results,
             dirs,
             openai_client,
             config,
-            force_process=True,  # 強制的に処理を実行
-            skip_twitter=True,  # Twitter投稿は常にスキップ
-            summary_dir=summary_dir  # カスタムサマリーディレクトリを指定
-        )
-        if success:
-            paper_data = {
-                'id': paper_id,
-                'title': paper.title,
-                'summary': paper.summary,
-                'url': paper.pdf_url
-            }
-            paper_cache[paper_key] = paper_data
-            processed_papers.append(paper_data)
-            save_cache(cache_dir, "paper", paper_cache)
+            summary_dir,
+            cache_conn,
+            force=args.force
+        ))
+    finally:
+        # PDF抽出用のワーカープロセスとその管理スレッドを終了する
+        shutdown_pdf_executor()
+    cache_conn.close()
 
     # HTMLページを生成
     logging.info(f"HTMLページを生成: {args.output_dir}")
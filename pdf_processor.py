@@ -2,47 +2,154 @@
 # -*- coding: utf-8 -*-
 
 import os
-import PyPDF2
 import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import pypdfium2 as pdfium
 
-def extract_text_from_pdf(pdf_path, output_dir):
-    """PDFからテキストを抽出する"""
+# このページ数未満のPDFはプロセス起動のコストが見合わないため逐次処理する
+PARALLEL_PAGE_THRESHOLD = 8
+
+# PDFiumはスレッドセーフではないため、同一プロセス内での呼び出しは直列化する
+_PDFIUM_LOCK = threading.Lock()
+
+# 複数の論文から同時に呼ばれても共有するプロセスプール
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+def _get_executor():
+    """
+    ページ抽出用のプロセスプールを取得する
+    
+    他のスレッドがPDFiumを使用中にforkすると子プロセスがロック状態を引き継ぐため、
+    forkserverでワーカーを起動する。
+    """
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context("forkserver")
+            )
+        return _EXECUTOR
+
+def shutdown_executor():
+    """ページ抽出用のプロセスプールを終了する（PDFの処理がすべて終わった後に呼び出す）"""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        executor, _EXECUTOR = _EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+def _reset_executor(broken):
+    """壊れたプロセスプールを破棄する（次回の_get_executorで作り直す）"""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        # 他のスレッドが既に作り直している場合は何もしない
+        if _EXECUTOR is broken:
+            _EXECUTOR = None
+    broken.shutdown(wait=False)
+
+def _extract_pages_parallel(pdf_path, num_pages):
+    """
+    ページごとにプロセスプールで並列抽出する（結果はページ順に返る）
+    
+    ワーカープロセスが異常終了してプールが壊れた場合は、プールを作り直して一度だけ再試行する。
+    """
+    for attempt in range(2):
+        executor = _get_executor()
+        try:
+            return list(executor.map(_extract_page, [pdf_path] * num_pages, range(num_pages)))
+        except BrokenProcessPool:
+            _reset_executor(executor)
+            if attempt == 1:
+                raise
+            logging.warning(f"プロセスプールが異常終了したため作り直して再試行します: {pdf_path}")
+
+def _read_page(pdf, idx):
+    """開いているPDFから指定ページのテキストを取り出す"""
+    page = pdf[idx]
+    textpage = page.get_textpage()
     try:
-        # 出力ファイルパスを作成
-        filename = os.path.basename(pdf_path)
-        base_name = os.path.splitext(filename)[0]
-        output_path = os.path.join(output_dir, f"{base_name}.txt")
+        return textpage.get_text_range()
+    finally:
+        textpage.close()
+        page.close()
+
+def _extract_page(pdf_path, idx):
+    """
+    PDFの指定ページからテキストを抽出する（ワーカープロセスで実行）
+    
+    Returns:
+        tuple: (ページ番号, テキスト)
+    """
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        return idx, _read_page(pdf, idx)
+    finally:
+        pdf.close()
+
+def extract_text_from_pdf(pdf_path, output_dir=None):
+    """
+    PDFからテキストを抽出する
+    
+    Args:
+        pdf_path (str): PDFファイルのパス
+        output_dir (str, optional): 指定した場合は抽出したテキストをこのディレクトリにも保存する
         
+    Returns:
+        str: 抽出したテキスト。失敗した場合はNone
+    """
+    try:
         # PDFファイルを開く
         logging.info(f"PDFファイルを開いています: {pdf_path}")
-        with open(pdf_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            num_pages = len(reader.pages)
-            logging.info(f"PDFファイルを読み込みました（ページ数: {num_pages}ページ）")
-            
-            # テキストを抽出
-            logging.info("PDFからテキストを抽出中...")
-            text = ""
-            for i, page in enumerate(reader.pages, 1):
-                text += page.extract_text() + "\n\n"
-                if i % 10 == 0:
-                    logging.info(f"  {i}/{num_pages}ページ処理完了")
-            
-            # 最後のページ数を表示
-            if num_pages % 10 != 0:
-                logging.info(f"  {num_pages}/{num_pages}ページ処理完了")
-            
-            logging.info(f"テキスト抽出完了（文字数: {len(text)}文字）")
-            
-            # テキストをファイルに保存
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(pdf_path)
+            num_pages = len(pdf)
+            if num_pages >= PARALLEL_PAGE_THRESHOLD:
+                pdf.close()
+        logging.info(f"PDFファイルを読み込みました（ページ数: {num_pages}ページ）")
+        
+        # テキストを抽出
+        logging.info("PDFからテキストを抽出中...")
+        if num_pages < PARALLEL_PAGE_THRESHOLD:
+            # ページ数が少ない場合は逐次処理
+            with _PDFIUM_LOCK:
+                try:
+                    pages = [(i, _read_page(pdf, i)) for i in range(num_pages)]
+                finally:
+                    pdf.close()
+        else:
+            # ページごとにプロセスプールで並列抽出
+            pages = _extract_pages_parallel(pdf_path, num_pages)
+        
+        parts = []
+        for i, page_text in pages:
+            parts.append(page_text)
+            parts.append("\n\n")
+            if (i + 1) % 10 == 0:
+                logging.info(f"  {i + 1}/{num_pages}ページ処理完了")
+        text = "".join(parts)
+        
+        # 最後のページ数を表示
+        if num_pages % 10 != 0:
+            logging.info(f"  {num_pages}/{num_pages}ページ処理完了")
+        
+        logging.info(f"テキスト抽出完了（文字数: {len(text)}文字）")
+        
+        # 指定された場合のみテキストをファイルに保存
+        if output_dir is not None:
+            filename = os.path.basename(pdf_path)
+            base_name = os.path.splitext(filename)[0]
+            output_path = os.path.join(output_dir, f"{base_name}.txt")
             logging.info(f"抽出したテキストをファイルに保存中: {output_path}")
             with open(output_path, 'w', encoding='utf-8', errors='ignore') as f:
                 f.write(text)
-            
-            logging.info(f"テキスト抽出・保存完了: {pdf_path} -> {output_path}（所要時間: {0:.2f}秒）")
-            
-            return output_path
+        
+        return text
     
     except Exception as e:
         logging.error(f"テキスト抽出エラー: {pdf_path} - {str(e)}")
-        return None
\ No newline at end of file
+        return None
@@ -3,83 +3,485 @@
 
 import os
 import json
-import glob
+import html
 import time
 import logging
 from datetime import datetime
 import shutil
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import pickle
+import hashlib
+import gzip
+import multiprocessing
+from string import Template
 from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
 
-def classify_logs_by_date(summary_dir, filter_keywords=None):
+# orjsonがあればC実装の高速なパーサーを使う（なければ標準のjsonを使う）
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# ijsonがあれば大きなサマリーファイルから必要なキーだけを逐次的に取り出す
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# brotliがあればHTMLのBrotli圧縮版も作成する
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# msgpackがあれば論文情報のキャッシュをmsgpackで保存する（なければpickleを使う）
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# サマリーファイルの解析で想定するエラー（JSONの構文エラーはValueErrorのサブクラス）
+SUMMARY_PARSE_ERRORS = (ValueError, OSError, KeyError, TypeError, AttributeError)
+if ijson is not None:
+    SUMMARY_PARSE_ERRORS += (ijson.JSONError,)
+
+# pyahocorasickがあればキーワードが多い場合に複数パターン照合を使う
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Webページ生成で使うサマリーファイルのキー
+SUMMARY_FIELDS = frozenset(('timestamp', 'title', 'summary', 'arxiv_id', 'keywords'))
+
+# このサイズ以上のサマリーファイルはijsonで必要なキーだけを読み込む
+STREAM_PARSE_MIN_BYTES = 16 * 1024
+
+# この数を超えるキーワードでフィルタリングする場合はAho-Corasick法で照合する
+AHOCORASICK_MIN_KEYWORDS = 8
+
+# 全ページ共通のHTMLの先頭（タイトルのみ差し替える）と末尾
+HTML_HEAD_FMT = """<!DOCTYPE html>
+    <html lang="ja">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>{title}</title>
+        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/css/bootstrap.min.css" rel="stylesheet">
+        <link rel="stylesheet" href="css/custom.css">
+    </head>
+    <body>
+"""
+
+HTML_TAIL = """        <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/js/bootstrap.bundle.min.js"></script>
+        <script src="js/custom.js"></script>
+    </body>
+    </html>
+    """
+
+# 論文カードのテンプレート（モジュール読み込み時に一度だけ作成する）
+_CARD_TEMPLATE = Template("""
+        <div class="col-md-6 mb-4">
+            <div class="card paper-card h-100">
+                <div class="card-body">
+                    <h5 class="paper-title">$title</h5>
+                    <h6 class="card-subtitle mb-2 text-muted">$formatted_date</h6>
+                    <div class="card-text mt-3">
+                        <p class="summary-text">$summary</p>
+                        <div class="mt-3">
+                            <a href="$arxiv_url" class="btn btn-sm btn-outline-primary">arXiv</a>
+                        </div>
+                    </div>
+                </div>
+            </div>
+        </div>
+        """)
+
+# このサイズ以上の出力ファイルはgzip/Brotliで圧縮したファイルも作成する
+PRECOMPRESS_MIN_BYTES = 1024
+
+# 日別ページの生成を複数プロセスで並列に行う最小ページ数
+DAILY_PARALLEL_THRESHOLD = 16
+
+# 前回のビルドで生成したページの入力ダイジェストを保存するファイル
+MANIFEST_FILE = '.build_manifest.json'
+
+# ページの生成方法のバージョン（マークアップや出力ファイルを変えたら上げて全ページを作り直す）
+BUILD_VERSION = 2
+
+# 解析済みのサマリーファイルの論文情報を保存するファイル（msgpackがない場合はpickle）
+PAPER_INFO_CACHE_FILE = '.paper_info_cache.msgpack' if msgpack is not None else '.paper_info.pkl'
+
+# 論文情報の形式のバージョン（形式を変えたら上げてキャッシュを無効にする）
+PAPER_INFO_VERSION = 4
+
+def _load_paper_info_cache(output_dir):
+    """
+    論文情報のキャッシュを読み込む
+    
+    Returns:
+        dict: {サマリーファイルのパス: (更新時刻[ns], 日付, 論文情報, キーワード照合用の文字列)}。
+            ファイルがない・壊れている・形式が古い場合は空の辞書
+    """
+    path = os.path.join(output_dir, PAPER_INFO_CACHE_FILE)
+    try:
+        with open(path, 'rb') as f:
+            if msgpack is not None:
+                cache = msgpack.unpackb(f.read())
+            else:
+                cache = pickle.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logging.warning(f"キャッシュファイルの読み込みエラー: {path} - {str(e)}")
+        return {}
+    if not isinstance(cache, dict) or cache.get('version') != PAPER_INFO_VERSION:
+        # 論文情報の形式が変わった場合は作り直す
+        return {}
+    return cache['entries']
+
+def _save_paper_info_cache(output_dir, entries):
+    """論文情報のキャッシュをアトミックに保存する"""
+    path = os.path.join(output_dir, PAPER_INFO_CACHE_FILE)
+    cache = {'version': PAPER_INFO_VERSION, 'entries': entries}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        if msgpack is not None:
+            f.write(msgpack.packb(cache))
+        else:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+def _atomic_write_bytes(path, data):
+    """バイト列を一時ファイル経由でアトミックに書き込む"""
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+def _remove_if_exists(path):
+    """ファイルがあれば削除する"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def _atomic_write(path, html_str):
+    """
+    HTMLを一度だけUTF-8にエンコードし、一時ファイル経由でアトミックに書き込む
+    
+    PRECOMPRESS_MIN_BYTES以上のファイルは、配信時に圧縮しなくて済むように
+    gzip（.gz）と、brotliがあればBrotli（.br）で圧縮したファイルも隣に書き込む。
+    """
+    data = html_str.encode('utf-8')
+    _atomic_write_bytes(path, data)
+    _write_precompressed(path, data)
+
+def _precompressed_up_to_date(path, data):
+    """圧縮したファイルが現在の設定（サイズの閾値、brotliの有無）どおりに揃っているか確認する"""
+    if len(data) < PRECOMPRESS_MIN_BYTES:
+        return not os.path.exists(f"{path}.gz") and not os.path.exists(f"{path}.br")
+    return os.path.exists(f"{path}.gz") and os.path.exists(f"{path}.br") == (brotli is not None)
+
+def _write_precompressed(path, data):
+    """gzip（.gz）と、brotliがあればBrotli（.br）で圧縮したファイルを書き込む"""
+    if len(data) < PRECOMPRESS_MIN_BYTES:
+        # 以前のビルドで作った圧縮ファイルが残っていれば古い内容になるため削除する
+        _remove_if_exists(f"{path}.gz")
+        _remove_if_exists(f"{path}.br")
+        return
+    _atomic_write_bytes(f"{path}.gz", gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _atomic_write_bytes(f"{path}.br", brotli.compress(data, quality=11, mode=brotli.MODE_TEXT))
+    else:
+        _remove_if_exists(f"{path}.br")
+
+def _write_if_changed(path, content):
+    """
+    内容が変わった場合のみファイルを書き込む（変わらなければmtimeを保つ）
+    
+    内容が同じでも圧縮したファイルが揃っていない場合は、圧縮したファイルだけを書き込む。
+    """
+    data = content.encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                if not _precompressed_up_to_date(path, data):
+                    _write_precompressed(path, data)
+                return
+    except FileNotFoundError:
+        pass
+    _atomic_write(path, content)
+
+def _precompress_formats():
+    """作成する圧縮ファイルの形式の一覧（brotliを後からインストールした場合などに全ページを作り直すため）"""
+    return ['gz', 'br'] if brotli is not None else ['gz']
+
+def _load_manifest(output_dir):
+    """前回のビルドで生成したページの入力ダイジェストを読み込む"""
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        manifest = {}
+    except Exception as e:
+        logging.warning(f"マニフェストの読み込みエラー: {manifest_path} - {str(e)}")
+        manifest = {}
+    precompress = _precompress_formats()
+    if (not isinstance(manifest, dict) or manifest.get('build_version') != BUILD_VERSION or
+            manifest.get('precompress') != precompress):
+        # 生成方法や作成する圧縮形式が変わった場合は入力が同じページも作り直す
+        manifest = {'build_version': BUILD_VERSION, 'precompress': precompress}
+    for key in ('dates', 'months', 'years'):
+        manifest.setdefault(key, {})
+    manifest.setdefault('index', None)
+    return manifest
+
+def _save_manifest(output_dir, manifest):
+    """生成したページの入力ダイジェストを保存する"""
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, manifest_path)
+
+def _digest(data):
+    """ページの入力データのダイジェストを計算する"""
+    return hashlib.sha1(json.dumps(data, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+def _format_now():
+    """ページに表示する最終更新日時を作成する"""
+    return datetime.now().strftime('%Y年%m月%d日 %H:%M')
+
+def _needs_update(manifest, section, key, digest, file_path):
+    """入力が前回から変わったか、出力ファイルがない場合にTrueを返す"""
+    return manifest[section].get(key) != digest or not os.path.exists(file_path)
+
+def _load_summary(summary_file):
+    """
+    サマリーファイルを読み込む
+    
+    小さなファイルはまとめて解析し、大きなファイルはijsonがあれば
+    必要なキーだけを取り出して残りの解析を省略する。
+    
+    Args:
+        summary_file: サマリーファイルのパス
+        
+    Returns:
+        dict: サマリーデータ
+    """
+    with open(summary_file, 'rb') as f:
+        if ijson is None or os.fstat(f.fileno()).st_size < STREAM_PARSE_MIN_BYTES:
+            return _json_loads(f.read())
+        
+        summary_data = {}
+        for key, value in ijson.kvitems(f, ''):
+            if key in SUMMARY_FIELDS:
+                summary_data[key] = value
+                if len(summary_data) == len(SUMMARY_FIELDS):
+                    break
+        return summary_data
+
+def _parse_one(summary_file, failures):
+    """
+    サマリーファイルを解析する（スレッドプールで実行）
+    
+    Args:
+        summary_file: サマリーファイルのパス
+        failures (list): 解析に失敗した場合に (パス, エラー) を追加するリスト
+        
+    Returns:
+        tuple: (日付, 論文情報, キーワード照合用の文字列)。
+            タイムスタンプがない場合は(None, None, None)、解析に失敗した場合はNone
+    """
+    try:
+        summary_data = _load_summary(summary_file)
+        
+        # タイムスタンプを解析
+        timestamp = summary_data.get('timestamp')
+        if not timestamp:
+            return None, None, None
+        date = timestamp.split()[0]  # YYYY-MM-DD
+        
+        # 論文情報を作成（HTMLに埋め込む文字列はここで一度だけエスケープする）
+        title = summary_data.get('title', 'Unknown')
+        summary = summary_data.get('summary', '要約情報がありません。')
+        keywords = summary_data.get('keywords', '')
+        arxiv_id = summary_data.get('arxiv_id')
+        paper_info = {
+            'title': html.escape(title),
+            'timestamp': timestamp,
+            # タイムスタンプは常に YYYY-MM-DD HH:MM:SS 形式のため、解析せずに切り出す
+            'formatted_date': f"{timestamp[0:4]}年{timestamp[5:7]}月{timestamp[8:10]}日 {timestamp[11:16]}",
+            'arxiv_id': html.escape(arxiv_id) if arxiv_id else arxiv_id,
+            'summary': html.escape(summary),
+            'keywords': keywords
+        }
+        # キーワードはエスケープ前の文字列と照合する（&gt; などの実体参照に誤一致しないように）
+        return date, paper_info, _keyword_haystack(keywords, title, summary)
+    except SUMMARY_PARSE_ERRORS as e:
+        # ログはまとめて出力するため、ここでは記録するだけにする
+        failures.append((summary_file, repr(e)))
+        return None
+
+def _keyword_haystack(keywords, title, summary):
+    """キーワード・タイトル・要約をNUL区切りで連結して小文字化する（フィールドをまたいだ誤一致を防ぐ）"""
+    return f"{keywords}\x00{title}\x00{summary}".lower()
+
+def _build_keyword_matcher(filter_keywords):
+    """
+    論文情報がいずれかのキーワードを含むか判定する関数を作成する
+    
+    キーワードの小文字化やオートマトンの構築はここで一度だけ行う。
+    
+    Args:
+        filter_keywords (list): フィルタリングするキーワードのリスト
+        
+    Returns:
+        function: _keyword_haystackで作成した文字列を受け取り、いずれかのキーワードを含む場合にTrueを返す関数
+    """
+    lowered = [keyword.lower() for keyword in filter_keywords]
+    
+    if ahocorasick is not None and len(lowered) > AHOCORASICK_MIN_KEYWORDS:
+        # 全キーワードを1回の走査で照合する
+        automaton = ahocorasick.Automaton()
+        for keyword in lowered:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        
+        def matches(haystack):
+            return next(automaton.iter(haystack), None) is not None
+        return matches
+    
+    def matches(haystack):
+        # いずれかのキーワードが含まれているか確認（キーワードごとに1回の走査）
+        return any(keyword in haystack for keyword in lowered)
+    return matches
+
+def classify_logs_by_date(summary_dir, filter_keywords=None, paper_info_cache=None):
     """
     サマリーファイルを日付ごとに分類する
     
     Args:
         summary_dir (str): サマリーファイルのディレクトリ
         filter_keywords (list, optional): フィルタリングするキーワードのリスト
+        paper_info_cache (dict, optional): {サマリーファイルのパス: (更新時刻[ns], 日付, 論文情報, キーワード照合用の文字列)}。
+            更新時刻が変わっていないファイルは解析を省略し、解析したファイルの結果はここに書き戻す
         
     Returns:
-        defaultdict: 日付ごとの論文情報
+        dict: 日付ごとの論文情報（日付の昇順）
     """
-    date_logs = defaultdict(list)
+    if paper_info_cache is None:
+        paper_info_cache = {}
     
     # サマリーファイルを検索
-    summary_files = glob.glob(os.path.join(summary_dir, '*_summary.json'))
-    if not summary_files:
+    with os.scandir(summary_dir) as it:
+        summary_entries = [entry for entry in it if entry.name.endswith('_summary.json') and entry.is_file()]
+    if not summary_entries:
         logging.warning(f"サマリーファイルが見つかりません: {summary_dir}")
-        return date_logs
+        return {}
+    
+    logging.info(f"サマリーファイル数: {len(summary_entries)}")
     
-    logging.info(f"サマリーファイル数: {len(summary_files)}")
+    # 現在存在しないファイルのキャッシュは破棄する
+    current_paths = {entry.path for entry in summary_entries}
+    for cached_path in list(paper_info_cache):
+        if cached_path not in current_paths:
+            del paper_info_cache[cached_path]
     
-    for summary_file in summary_files:
+    # 前回から更新されたファイルを抽出
+    stale_files = []
+    failures = []
+    for entry in summary_entries:
         try:
-            with open(summary_file, 'r', encoding='utf-8') as f:
-                summary_data = json.load(f)
-            
-            # タイムスタンプを解析
-            timestamp = summary_data.get('timestamp')
-            if timestamp:
-                date = timestamp.split()[0]  # YYYY-MM-DD
-                
-                # キーワードフィルタリング
-                if filter_keywords:
-                    # サマリーデータにキーワード情報がある場合
-                    paper_keywords = summary_data.get('keywords', '').lower()
-                    paper_title = summary_data.get('title', '').lower()
-                    paper_summary = summary_data.get('summary', '').lower()
-                    
-                    # いずれかのキーワードが含まれているか確認
-                    match_found = False
-                    for keyword in filter_keywords:
-                        keyword = keyword.lower()
-                        if (keyword in paper_keywords or
-                            keyword in paper_title or
-                            keyword in paper_summary):
-                            match_found = True
-                            break
-                    
-                    # マッチしない場合はスキップ
-                    if not match_found:
-                        continue
-                
-                # 論文情報を作成
-                paper_info = {
-                    'title': summary_data.get('title', 'Unknown'),
-                    'timestamp': timestamp,
-                    'formatted_date': datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").strftime("%Y年%m月%d日 %H:%M"),
-                    'arxiv_id': summary_data.get('arxiv_id'),
-                    'summary': summary_data.get('summary', '要約情報がありません。'),
-                    'keywords': summary_data.get('keywords', '')
-                }
-                date_logs[date].append(paper_info)
-        except Exception as e:
-            logging.error(f"サマリーファイル {summary_file} の解析エラー: {str(e)}")
+            mtime = entry.stat().st_mtime_ns
+        except OSError as e:
+            failures.append((entry.path, repr(e)))
+            paper_info_cache.pop(entry.path, None)
+            continue
+        cached = paper_info_cache.get(entry.path)
+        if cached is None or cached[0] != mtime:
+            stale_files.append((entry.path, mtime))
+    
+    # 更新されたファイルをスレッドプールで並行して解析
+    if stale_files:
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            parsed_results = executor.map(lambda path: _parse_one(path, failures), [path for path, _ in stale_files])
+            for (summary_file, mtime), parsed in zip(stale_files, parsed_results):
+                if parsed is None:
+                    paper_info_cache.pop(summary_file, None)
+                else:
+                    paper_info_cache[summary_file] = (mtime, *parsed)
+    
+    if failures:
+        logging.warning(f"サマリーファイルの解析エラー: {len(failures)}件 {failures[:10]}")
+    
+    # (日付, 論文情報) を集めてから日付でまとめる（同じ日付の中はディレクトリの順）
+    matches = _build_keyword_matcher(filter_keywords) if filter_keywords else None
+    dated_papers = []
+    for entry in summary_entries:
+        cached = paper_info_cache.get(entry.path)
+        if cached is None or cached[2] is None:
+            continue
+        _, date, paper_info, haystack = cached
+        
+        # キーワードフィルタリング（マッチしない場合はスキップ）
+        if matches is not None and not matches(haystack):
+            continue
+        
+        dated_papers.append((date, paper_info))
+    
+    dated_papers.sort(key=itemgetter(0))
+    date_logs = {date: [paper_info for _, paper_info in group]
+                 for date, group in groupby(dated_papers, key=itemgetter(0))}
     
     logging.info(f"分類された論文数: {sum(len(papers) for papers in date_logs.values())}")
     return date_logs
 
+def _build_date_index(date_logs, dates_desc=None):
+    """日付を年・年月ごとにまとめた索引と論文数を作成する
+    
+    Args:
+        date_logs: 日付ごとの論文情報の辞書
+        dates_desc: 新しい順にソート済みの日付リスト（省略時はソートする）
+        
+    Returns:
+        (年月ごとの日付, 年ごとの日付, 年月ごとの論文数, 年ごとの論文数) のタプル。
+        日付・年・年月はいずれも新しい順に並ぶ。
+    """
+    if dates_desc is None:
+        dates_desc = sorted(date_logs.keys(), reverse=True)
+    by_ym = defaultdict(list)
+    by_year = defaultdict(list)
+    ym_counts = defaultdict(int)
+    year_counts = defaultdict(int)
+    for date in dates_desc:
+        count = len(date_logs[date])
+        y, m = date[:4], date[5:7]
+        by_ym[(y, m)].append(date)
+        by_year[y].append(date)
+        ym_counts[(y, m)] += count
+        year_counts[y] += count
+    return by_ym, by_year, ym_counts, year_counts
+
 def generate_webpage(summary_dir, output_dir, current_only=False, current_date=None, verbose=False, filter_keywords=None):
-    """Webページを生成する"""
+    """
+    Webページを生成する
+    
+    前回の生成時から入力が変わったページだけを書き直す。
+    各ページの入力ダイジェストは出力ディレクトリのマニフェストに保存する。
+    """
     # 出力ディレクトリを作成
     os.makedirs(output_dir, exist_ok=True)
     
@@ -127,8 +529,7 @@ def generate_webpage(summary_dir, output_dir, current_only=False, current_date=N
     }
     """
     
-    with open(os.path.join(css_dir, 'custom.css'), 'w') as f:
-        f.write(css_content)
+    _write_if_changed(os.path.join(css_dir, 'custom.css'), css_content)
     
     # JavaScriptファイルを作成
     js_content = """
@@ -202,40 +603,98 @@ def generate_webpage(summary_dir, output_dir, current_only=False, current_date=N
     });
     """
     
-    with open(os.path.join(js_dir, 'custom.js'), 'w') as f:
-        f.write(js_content)
+    _write_if_changed(os.path.join(js_dir, 'custom.js'), js_content)
+    
+    # サマリーファイルを日付ごとに分類（前回から変わっていないファイルは解析を省略）
+    paper_info_cache = _load_paper_info_cache(output_dir)
+    date_logs = classify_logs_by_date(summary_dir, filter_keywords, paper_info_cache)
+    _save_paper_info_cache(output_dir, paper_info_cache)
+    
+    # 日付のソートと年・年月ごとの索引の作成は一度だけ行う
+    dates_desc = sorted(date_logs.keys(), reverse=True)
+    by_ym, by_year, ym_counts, year_counts = _build_date_index(date_logs, dates_desc)
+    
+    # 前回のビルドのマニフェストを読み込む
+    manifest = _load_manifest(output_dir)
+    
+    # 出力ファイルのパスはディレクトリの接頭辞に連結して作る
+    out_prefix = output_dir.rstrip('/\\') + os.sep
     
-    # サマリーファイルを日付ごとに分類
-    date_logs = classify_logs_by_date(summary_dir, filter_keywords)
+    # 最終更新日時は全ページで共通のため一度だけ作成する
+    now_str = _format_now()
     
-    # 日付でソート
-    dates = sorted(date_logs.keys(), reverse=True)
+    dates = dates_desc
     
     # 現在の日付のみを処理する場合
     if current_only and current_date:
         dates = [d for d in dates if d == current_date]
     
-    # 各日付のページを生成
+    # 入力が変わった日付のページを生成
+    months = set()
+    years = set()
+    updated_count = 0
+    stale_dates = []
     for date in dates:
         papers = date_logs[date]
-        year, month, _ = date.split('-')
+        year, month = date[:4], date[5:7]
+        months.add((year, month))
+        years.add(year)
         
-        # 日別ページを生成
-        generate_daily_page(date, papers, output_dir)
-        
-        # 月別インデックスを生成
-        generate_monthly_index(year, month, date_logs, output_dir)
-        
-        # 年別インデックスを生成
-        generate_yearly_index(year, date_logs, output_dir)
-    
-    # メインインデックスを生成
-    generate_main_index(date_logs, output_dir)
+        digest = _digest(papers)
+        if _needs_update(manifest, 'dates', date, digest, f"{out_prefix}{date}.html"):
+            stale_dates.append(date)
+            manifest['dates'][date] = digest
+    
+    # 日別ページを生成（日付ごとに独立しているため、多い場合は複数プロセスで並列に生成）
+    tasks = [(date, date_logs[date], output_dir, now_str) for date in stale_dates]
+    if len(tasks) >= DAILY_PARALLEL_THRESHOLD:
+        # 呼び出し元のプロセスにスレッドが残っていてもforkしないよう、forkserverでワーカーを起動する
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("forkserver")) as executor:
+            list(executor.map(_render_daily, tasks, chunksize=8))
+    else:
+        for task in tasks:
+            _render_daily(task)
+    updated_count += len(tasks)
+    
+    # 日付ごとの件数が変わった月別インデックスを生成
+    for year, month in months:
+        digest = _digest([(d, len(date_logs[d])) for d in by_ym[(year, month)]])
+        if _needs_update(manifest, 'months', f"{year}-{month}", digest, f"{out_prefix}{year}-{month}.html"):
+            generate_monthly_index(year, month, date_logs, output_dir, now_str, by_ym)
+            manifest['months'][f"{year}-{month}"] = digest
+            updated_count += 1
+    
+    # 日付ごとの件数が変わった年別インデックスを生成
+    for year in years:
+        digest = _digest([(d, len(date_logs[d])) for d in by_year[year]])
+        if _needs_update(manifest, 'years', year, digest, f"{out_prefix}{year}.html"):
+            generate_yearly_index(year, date_logs, output_dir, now_str, by_year, ym_counts)
+            manifest['years'][year] = digest
+            updated_count += 1
+    
+    # 最新の論文または件数が変わった場合はメインインデックスを生成
+    latest_dates = dates_desc[:5]
+    digest = _digest({
+        'counts': [(d, len(date_logs[d])) for d in dates_desc],
+        'latest': [date_logs[d] for d in latest_dates]
+    })
+    if manifest['index'] != digest or not os.path.exists(f"{out_prefix}index.html"):
+        generate_main_index(date_logs, output_dir, now_str, by_year, ym_counts, year_counts, dates_desc)
+        manifest['index'] = digest
+        updated_count += 1
+    
+    _save_manifest(output_dir, manifest)
+    logging.info(f"更新したページ数: {updated_count}")
+
+def _render_daily(task):
+    """日別ページを生成する（ProcessPoolExecutorから呼び出すためモジュールレベルに定義）"""
+    date, papers, output_dir, now_str = task
+    generate_daily_page(date, papers, output_dir, now_str)
 
-def generate_daily_page(date, papers, output_dir):
+def generate_daily_page(date, papers, output_dir, now_str=None):
     """日付ごとのページを生成する"""
     # 年月日を分解
-    year, month, day = date.split('-')
+    year, month, day = date[:4], date[5:7], date[8:10]
     
     # ナビゲーションリンクを作成
     nav_html = f"""
@@ -250,19 +709,23 @@ def generate_daily_page(date, papers, output_dir):
     """
     
     # HTMLを生成
-    html = generate_html_template(f"{year}年{month}月{day}日の論文要約", papers, nav_html)
+    html = generate_html_template(f"{year}年{month}月{day}日の論文要約", papers, nav_html, now_str=now_str)
     
     # ファイルに保存
     file_path = os.path.join(output_dir, f"{date}.html")
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+    _atomic_write(file_path, html)
 
-def generate_monthly_index(year, month, date_logs, output_dir):
+def generate_monthly_index(year, month, date_logs, output_dir, now_str=None, by_ym=None):
     """月別インデックスページを生成する"""
+    if now_str is None:
+        now_str = _format_now()
+    if by_ym is None:
+        by_ym = _build_date_index(date_logs)[0]
+    
     # 月内の日付リンクリスト
     date_links = []
-    for date in sorted([d for d in date_logs.keys() if d.startswith(f"{year}-{month}")], reverse=True):
-        y, m, d = date.split('-')
+    for date in by_ym[(year, month)]:
+        y, m, d = date[:4], date[5:7], date[8:10]
         date_links.append(f'<li><a href="{date}.html">{y}年{m}月{d}日</a> ({len(date_logs[date])}件)</li>')
     
     # ナビゲーションリンクを作成
@@ -277,21 +740,11 @@ def generate_monthly_index(year, month, date_logs, output_dir):
     """
     
     # HTMLを生成
-    html = f"""<!DOCTYPE html>
-    <html lang="ja">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{year}年{month}月の論文要約</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/css/bootstrap.min.css" rel="stylesheet">
-        <link rel="stylesheet" href="css/custom.css">
-    </head>
-    <body>
-        <div class="container py-4">
+    html = HTML_HEAD_FMT.format(title=f"{year}年{month}月の論文要約") + f"""        <div class="container py-4">
             <header class="pb-3 mb-4 border-bottom">
                 <div class="d-flex align-items-center text-dark text-decoration-none">
                     <span class="fs-4">{year}年{month}月の論文要約</span>
-                    <span class="ms-auto">最終更新: {datetime.now().strftime('%Y年%m月%d日 %H:%M')}</span>
+                    <span class="ms-auto">最終更新: {now_str}</span>
                 </div>
             </header>
             
@@ -317,27 +770,27 @@ def generate_monthly_index(year, month, date_logs, output_dir):
             </div>
         </div>
         
-        <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/js/bootstrap.bundle.min.js"></script>
-        <script src="js/custom.js"></script>
-    </body>
-    </html>
-    """
+""" + HTML_TAIL
     
     # ファイルに保存
     file_path = os.path.join(output_dir, f"{year}-{month}.html")
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+    _atomic_write(file_path, html)
 
-def generate_yearly_index(year, date_logs, output_dir):
+def generate_yearly_index(year, date_logs, output_dir, now_str=None, by_year=None, ym_counts=None):
     """年別インデックスページを生成する"""
+    if now_str is None:
+        now_str = _format_now()
+    if by_year is None or ym_counts is None:
+        _, by_year, ym_counts, _ = _build_date_index(date_logs)
+    
     # 年内の月を抽出
-    months = sorted(set([d.split('-')[1] for d in date_logs.keys() if d.startswith(f"{year}-")]), reverse=True)
+    months = list(dict.fromkeys(d[5:7] for d in by_year[year]))
     
     # 月別リンクリスト
     month_links = []
     for month in months:
-        # 月内の論文数をカウント
-        month_papers_count = sum(len(date_logs[d]) for d in date_logs.keys() if d.startswith(f"{year}-{month}"))
+        # 月内の論文数
+        month_papers_count = ym_counts[(year, month)]
         month_links.append(f'<li><a href="{year}-{month}.html">{year}年{month}月</a> ({month_papers_count}件)</li>')
     
     # ナビゲーションリンクを作成
@@ -351,21 +804,11 @@ def generate_yearly_index(year, date_logs, output_dir):
     """
     
     # HTMLを生成
-    html = f"""<!DOCTYPE html>
-    <html lang="ja">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{year}年の論文要約</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/css/bootstrap.min.css" rel="stylesheet">
-        <link rel="stylesheet" href="css/custom.css">
-    </head>
-    <body>
-        <div class="container py-4">
+    html = HTML_HEAD_FMT.format(title=f"{year}年の論文要約") + f"""        <div class="container py-4">
             <header class="pb-3 mb-4 border-bottom">
                 <div class="d-flex align-items-center text-dark text-decoration-none">
                     <span class="fs-4">{year}年の論文要約</span>
-                    <span class="ms-auto">最終更新: {datetime.now().strftime('%Y年%m月%d日 %H:%M')}</span>
+                    <span class="ms-auto">最終更新: {now_str}</span>
                 </div>
             </header>
             
@@ -391,24 +834,24 @@ def generate_yearly_index(year, date_logs, output_dir):
             </div>
         </div>
         
-        <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/js/bootstrap.bundle.min.js"></script>
-        <script src="js/custom.js"></script>
-    </body>
-    </html>
-    """
+""" + HTML_TAIL
     
     # ファイルに保存
     file_path = os.path.join(output_dir, f"{year}.html")
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+    _atomic_write(file_path, html)
 
-def generate_main_index(date_logs, output_dir):
+def generate_main_index(date_logs, output_dir, now_str=None, by_year=None, ym_counts=None, year_counts=None, dates_desc=None):
     """メインインデックスページを生成する"""
+    if dates_desc is None:
+        dates_desc = sorted(date_logs.keys(), reverse=True)
+    if by_year is None or ym_counts is None or year_counts is None:
+        _, by_year, ym_counts, year_counts = _build_date_index(date_logs, dates_desc)
+    
     # 最新の日付を取得
-    latest_dates = sorted(date_logs.keys(), reverse=True)[:5]  # 最新5日分
+    latest_dates = dates_desc[:5]  # 最新5日分
     
     # 年のリストを作成
-    years = sorted(set([d.split('-')[0] for d in date_logs.keys()]), reverse=True)
+    years = list(by_year)
     
     # 最新の論文を取得
     latest_papers = []
@@ -419,47 +862,40 @@ def generate_main_index(date_logs, output_dir):
     latest_papers = sorted(latest_papers, key=lambda x: x.get('timestamp', ''), reverse=True)[:10]
     
     # アーカイブリンクを作成
-    archive_html = '<div class="card mt-4"><div class="card-header">アーカイブ</div><div class="card-body">'
+    archive_parts = ['<div class="card mt-4"><div class="card-header">アーカイブ</div><div class="card-body">']
     
     # 年別リンク
     for year in years:
-        # 年内の論文数をカウント
-        year_papers_count = sum(len(date_logs[d]) for d in date_logs.keys() if d.startswith(f"{year}-"))
-        archive_html += f'<h5><a href="{year}.html">{year}年</a> ({year_papers_count}件)</h5>'
+        # 年内の論文数
+        year_papers_count = year_counts[year]
+        archive_parts.append(f'<h5><a href="{year}.html">{year}年</a> ({year_papers_count}件)</h5>')
         
         # 月別リンク（最新の年のみ表示）
         if year == years[0]:
-            archive_html += '<ul>'
-            months = sorted(set([d.split('-')[1] for d in date_logs.keys() if d.startswith(f"{year}-")]), reverse=True)
+            archive_parts.append('<ul>')
+            months = list(dict.fromkeys(d[5:7] for d in by_year[year]))
             for month in months:
-                # 月内の論文数をカウント
-                month_papers_count = sum(len(date_logs[d]) for d in date_logs.keys() if d.startswith(f"{year}-{month}"))
-                archive_html += f'<li><a href="{year}-{month}.html">{year}年{month}月</a> ({month_papers_count}件)</li>'
-            archive_html += '</ul>'
+                # 月内の論文数
+                month_papers_count = ym_counts[(year, month)]
+                archive_parts.append(f'<li><a href="{year}-{month}.html">{year}年{month}月</a> ({month_papers_count}件)</li>')
+            archive_parts.append('</ul>')
     
-    archive_html += '</div></div>'
+    archive_parts.append('</div></div>')
+    archive_html = "".join(archive_parts)
     
     # HTMLを生成
-    html = generate_html_template("arXiv論文要約", latest_papers, "", archive_html)
+    html = generate_html_template("arXiv論文要約", latest_papers, "", archive_html, now_str=now_str)
     
     # ファイルに保存
     file_path = os.path.join(output_dir, "index.html")
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+    _atomic_write(file_path, html)
 
-def generate_html_template(title, papers, navigation="", archive=""):
+def generate_html_template(title, papers, navigation="", archive="", now_str=None):
     """基本的なHTMLテンプレートを生成する"""
-    html = f"""<!DOCTYPE html>
-    <html lang="ja">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{title}</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/css/bootstrap.min.css" rel="stylesheet">
-        <link rel="stylesheet" href="css/custom.css">
-    </head>
-    <body>
-        <!-- コピー成功モーダル -->
+    if now_str is None:
+        now_str = _format_now()
+    
+    html = HTML_HEAD_FMT.format(title=title) + f"""        <!-- コピー成功モーダル -->
         <div class="modal fade" id="copyModal" tabindex="-1" aria-labelledby="copyModalLabel" aria-hidden="true">
             <div class="modal-dialog modal-sm modal-dialog-centered">
                 <div class="modal-content">
@@ -474,7 +910,7 @@ def generate_html_template(title, papers, navigation="", archive=""):
             <header class="pb-3 mb-4 border-bottom">
                 <div class="d-flex align-items-center text-dark text-decoration-none">
                     <span class="fs-4">{title}</span>
-                    <span class="ms-auto">最終更新: {datetime.now().strftime('%Y年%m月%d日 %H:%M')}</span>
+                    <span class="ms-auto">最終更新: {now_str}</span>
                 </div>
             </header>
             
@@ -491,17 +927,13 @@ def generate_html_template(title, papers, navigation="", archive=""):
             {archive}
         </div>
         
-        <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/js/bootstrap.bundle.min.js"></script>
-        <script src="js/custom.js"></script>
-    </body>
-    </html>
-    """
+""" + HTML_TAIL
     
     return html
 
 def generate_paper_cards(papers):
     """論文カードのHTMLを生成する"""
-    cards_html = ""
+    cards = []
     
     for paper in papers:
         # arXivリンク
@@ -509,24 +941,11 @@ def generate_paper_cards(papers):
         if paper.get('arxiv_id'):
             arxiv_url = f"https://arxiv.org/abs/{paper['arxiv_id']}"
         
-        # 要約文
-        summary = paper.get('summary', '要約情報がありません。')
-        
-        cards_html += f"""
-        <div class="col-md-6 mb-4">
-            <div class="card paper-card h-100">
-                <div class="card-body">
-                    <h5 class="paper-title">{paper['title']}</h5>
-                    <h6 class="card-subtitle mb-2 text-muted">{paper.get('formatted_date', '')}</h6>
-                    <div class="card-text mt-3">
-                        <p class="summary-text">{summary}</p>
-                        <div class="mt-3">
-                            <a href="{arxiv_url}" class="btn btn-sm btn-outline-primary">arXiv</a>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        """
-    
-    return cards_html
\ No newline at end of file
+        cards.append(_CARD_TEMPLATE.substitute(
+            title=paper['title'],
+            formatted_date=paper.get('formatted_date', ''),
+            summary=paper.get('summary', '要約情報がありません。'),
+            arxiv_url=arxiv_url
+        ))
+    
+    return "".join(cards)